@@ -22,6 +22,7 @@ class TosConfig:
         DEPLOY_MODE:    The deployment mode
         TOS_BUCKETS:    The bucket list to use for the TOS service
         MAX_OBJECT_SIZE: The maximum size of an object in bytes
+        DOWNLOAD_CHUNK_SIZE: The chunk size in bytes used when streaming object bodies
     """
     access_key: str
     secret_key: str
@@ -30,6 +31,7 @@ class TosConfig:
     security_token: str
     deploy_mode: str
     max_object_size: int
+    download_chunk_size: int
     buckets: List[str]
 
 
@@ -81,6 +83,7 @@ def load_config() -> TosConfig:
         deploy_mode=deploy_mode,
         buckets=os.getenv("TOS_BUCKETS", "").split(","),
         max_object_size=int(os.getenv("MAX_OBJECT_SIZE", "262144")),
+        download_chunk_size=int(os.getenv("DOWNLOAD_CHUNK_SIZE", "1048576")),
     )
     logger.info(f"Loaded configuration successfully")
 
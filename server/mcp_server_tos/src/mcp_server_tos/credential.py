@@ -1,9 +1,60 @@
+import re
 from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Dict, Optional
 
+try:
+    from pybase64 import b64decode as _b64decode
+except ImportError:
+    from base64 import b64decode as _b64decode  # type: ignore[assignment]
 
-@dataclass
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads  # type: ignore[assignment]
+
+# 标准 base64 字符集，解码前先用于过滤明显非法的 authorization
+_B64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+
+# 按行折叠的 base64 (如 base64 命令行输出) 中的 ASCII 空白字符，校验前去除，与标准库 b64decode 的非严格模式一致
+_ASCII_WHITESPACE = str.maketrans('', '', ' \t\n\r\x0b\x0c')
+
+# 一次 C 层调用取出全部必填字段
+_REQUIRED_FIELDS = itemgetter('AccessKeyId', 'SecretAccessKey', 'SessionToken')
+
+
+@dataclass(slots=True, frozen=True)
 class Credential:
     access_key: str
     secret_key: str
     security_token: str
-    expired_time: str
+    expired_time: Optional[str]
+
+
+def parse_auth(auth: str) -> Credential:
+    """
+    解析 authorization 中 base64 编码的 sts json，得到临时凭证
+    纯函数且带完整类型标注，不依赖请求上下文，可单独交给 mypyc 编译
+    """
+    _, sep, base64_data = auth.partition(' ')
+    if not sep:
+        base64_data = auth
+    base64_data = base64_data.translate(_ASCII_WHITESPACE)
+    if len(base64_data) & 3 or not _B64_RE.fullmatch(base64_data):
+        raise ValueError("Invalid credentials, authorization is not valid base64")
+
+    # 解码 Base64
+    # orjson 可直接解析 bytes，省去一次 utf-8 解码
+    data: Dict[str, Any] = _json_loads(_b64decode(base64_data))
+    if not isinstance(data, dict):
+        raise ValueError("Invalid credentials ak, sk, session_token is null")
+    # 获取字段
+    expired_time: Optional[str] = data.get('ExpiredTime')
+    try:
+        ak, sk, session_token = _REQUIRED_FIELDS(data)
+    except KeyError:
+        raise ValueError("Invalid credentials ak, sk, session_token is null") from None
+    if not ak or not sk or not session_token:
+        raise ValueError("Invalid credentials ak, sk, session_token is null")
+
+    return Credential(ak, sk, session_token, expired_time)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import argparse
 
@@ -23,13 +24,20 @@ def main():
 
     args = parser.parse_args()
 
+    try:
+        # uvloop 为可选依赖（不支持 Windows），安装后替换默认事件循环以降低调度开销
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     try:
         # Run the MCP server
         logger.info(f"Starting TOS MCP Server")
 
         mcp.run(transport=args.transport)
     except Exception as e:
-        logger.error(f"Error starting TOS MCP Server: {str(e)}")
+        logger.error("Error starting TOS MCP Server: %s", e)
         raise
 
 
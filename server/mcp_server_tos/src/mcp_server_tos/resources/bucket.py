@@ -1,7 +1,8 @@
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from mcp_server_tos.resources.service import TosResource
+from mcp_server_tos.resources.service import TosResource, read_error_body, response_json
 
 from mcp_server_tos.config import TosConfig
 
@@ -15,6 +16,8 @@ class BucketResource(TosResource):
 
     def __init__(self, config: TosConfig):
         super(BucketResource, self).__init__(config)
+        # 进行中的 ListObjects 请求，参数完全相同的并发调用共享同一次请求的结果
+        self._inflight_list_objects: Dict[Tuple, asyncio.Future] = {}
 
     async def list_buckets(self) -> List[dict]:
         """
@@ -24,16 +27,16 @@ class BucketResource(TosResource):
         if self.configured_buckets:
             resp = await self.get(bucket="")
             configured_bucket_list = [
-                bucket for bucket in resp.json().get("buckets", [])
+                bucket for bucket in response_json(resp).get("buckets", [])
                 if bucket['Name'] in self.configured_buckets
             ]
             return configured_bucket_list
         else:
             resp = await self.get(bucket="")
             if resp.status_code == 200:
-                return resp.json().get("Buckets", [])
+                return response_json(resp).get("Buckets", [])
             else:
-                raise Exception(f"list buckets failed, tos server return: {resp.json()}")
+                raise Exception(f"list buckets failed, tos server return: {await read_error_body(resp)}")
 
     async def list_objects(self, bucket: str, prefix: Optional[str] = None, start_after: Optional[str] = None,
                            continuation_token: Optional[str] = None) -> str:
@@ -46,7 +49,17 @@ class BucketResource(TosResource):
             start_after: 起始位置
             continuation_token: 分页标记
         """
+        request_key = (bucket, prefix, start_after, continuation_token)
+        task = self._inflight_list_objects.get(request_key)
+        if task is None:
+            task = asyncio.ensure_future(self._list_objects(bucket, prefix, start_after, continuation_token))
+            self._inflight_list_objects[request_key] = task
+            task.add_done_callback(lambda _: self._inflight_list_objects.pop(request_key, None))
+        # shield 避免某个调用方被取消时连带取消其他调用方共享的请求
+        return await asyncio.shield(task)
 
+    async def _list_objects(self, bucket: str, prefix: Optional[str], start_after: Optional[str],
+                            continuation_token: Optional[str]) -> str:
         query = {"list-type": "2"}
         if prefix:
             query["prefix"] = prefix
@@ -57,6 +70,6 @@ class BucketResource(TosResource):
 
         resp = await self.get(bucket=bucket, params=query)
         if resp.status_code == 200:
-            return resp.json()
+            return response_json(resp)
         else:
-            raise Exception(f"list objects failed, tos server return: {resp.json()}")
+            raise Exception(f"list objects failed, tos server return: {await read_error_body(resp)}")
@@ -1,14 +1,44 @@
-import base64
+import asyncio
+import functools
 import logging
-from base64 import b64encode
-from optparse import Option
-from typing import Optional
+from typing import List, Optional, Tuple
 
 from mcp_server_tos.config import TosConfig
-from mcp_server_tos.resources.service import TosResource
+from mcp_server_tos.resources.service import TosResource, read_error_body
+
+try:
+    # pybase64 在导入时选择最优的 SIMD 实现 (AVX2/AVX-512/NEON)，大对象编码远快于标准库
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    from base64 import b64encode as _b64encode
 
 logger = logging.getLogger(__name__)
 
+# 文本文件扩展名，str.endswith 接收 tuple 时在 C 层一次完成所有后缀的比较
+_TEXT_EXTENSIONS = (
+    '.txt', '.log', '.json', '.xml', '.yml', '.yaml', '.md',
+    '.csv', '.ini', '.conf', '.py', '.js', '.html', '.css',
+    '.sh', '.bash', '.cfg', '.properties'
+)
+_MAX_TEXT_EXTENSION_LEN = max(len(ext) for ext in _TEXT_EXTENSIONS)
+
+# 错误信息模板，仅在实际抛出异常时格式化
+_OBJECT_TOO_LARGE_MSG = "Bucket: %s object: %s is too large, more than %d bytes"
+_BODY_LENGTH_MISMATCH_MSG = "response body is longer than content-length %d"
+
+# 读取的块达到该字节数时，base64 编码放到线程中执行
+_OFFLOAD_THRESHOLD = 1 << 20
+
+# 转存 (saveas) 请求只返回 json 结果，使用更小的大小上限
+_SAVEAS_MAX_SIZE = 1 << 20
+
+# get_objects 的最大并发请求数
+_MAX_CONCURRENT_FETCHES = 16
+
+# video/snapshot 参数前缀 (",简写_")，与 video_snapshot 的 time, width, height, mode, output_format, auto_rotate 依次对应，
+# 预先拼好后每次请求只需追加参数值
+_SNAPSHOT_PARAM_PREFIXES = tuple(f",{code}_" for code in ("t", "w", "h", "m", "f", "ar"))
+
 
 class ObjectResource(TosResource):
     """
@@ -18,6 +48,7 @@ class ObjectResource(TosResource):
     def __init__(self, config: TosConfig):
         super(ObjectResource, self).__init__(config)
         self.max_object_size = config.max_object_size
+        self.download_chunk_size = config.download_chunk_size
 
     async def get_object(self, bucket_name: str, key: str) -> str:
         """
@@ -29,29 +60,23 @@ class ObjectResource(TosResource):
         Returns:
             对象内容
         """
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
+        return await self._fetch_body(bucket_name, key, b64=not is_text_file(key), action="get object")
 
-        response = None
-        try:
-            response = await self.get(bucket=bucket_name, key=key)
-            if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
+    async def get_objects(self, objects: List[Tuple[str, str]]) -> List[str]:
+        """
+        并发获取多个对象内容，并发数受 _MAX_CONCURRENT_FETCHES 限制，复用同一连接池
+        Args:
+            objects: (存储桶名称, 对象名称) 列表
+        Returns:
+            与 objects 顺序一致的对象内容列表
+        """
+        semaphore = asyncio.BoundedSemaphore(_MAX_CONCURRENT_FETCHES)
 
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
+        async def fetch(bucket_name: str, key: str) -> str:
+            async with semaphore:
+                return await self.get_object(bucket_name, key)
 
-                if is_text_file(key):
-                    return content.decode('utf-8')
-                else:
-                    return base64.b64encode(content).decode()
-            else:
-                raise Exception(f"get object failed, tos server return: {response.json()}")
-        finally:
-            if response is not None:
-                await response.aclose()
+        return await asyncio.gather(*(fetch(bucket_name, key) for bucket_name, key in objects))
 
     async def video_info(self, bucket_name: str, key: str) -> str:
         """
@@ -66,26 +91,7 @@ class ObjectResource(TosResource):
 
         query = {"x-tos-process": "video/info"}
 
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
-
-        response = None
-        try:
-            response = await self.get(bucket=bucket_name, key=key, params=query)
-            if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
-
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
-
-                return content.decode('utf-8')
-            else:
-                raise Exception(f"get video info failed, tos server return: {response.json()}")
-        finally:
-            if response is not None:
-                await response.aclose()
+        return await self._fetch_body(bucket_name, key, query, b64=False, action="get video info", buffered=True)
 
     async def video_snapshot(self, bucket_name: str, key: str, time: Optional[int] = None,
                              width: Optional[int] = None, height: Optional[int] = None, mode: Optional[str] = None,
@@ -116,62 +122,193 @@ class ObjectResource(TosResource):
             如果指定了saveas参数，则返回转存后的对象信息，json格式；否则返回截帧后的图片文件，jpg或png格式，base64编码
         """
 
-        params = {}
-        if time is not None:
-            params["t"] = time
-        if width is not None:
-            params["w"] = width
-        if height is not None:
-            params["h"] = height
-        if mode is not None:
-            params["m"] = mode
-        if output_format is not None:
-            params["f"] = output_format
-        if auto_rotate is not None:
-            params["ar"] = auto_rotate
-
-        if len(params) > 0:
-            query = {"x-tos-process": "video/snapshot" + "".join(
-                f",{k}_{v}" for k, v in params.items() if v is not None
-            )}
-        else:
-            query = {"x-tos-process": "video/snapshot"}
+        query = {"x-tos-process": _snapshot_process(time, width, height, mode, output_format, auto_rotate)}
 
-        if saveas_object:
-            query["x-tos-save-object"] = base64.b64encode(saveas_object.encode('utf-8')).decode('ascii')
         if saveas_bucket:
-            query["x-tos-save-bucket"] = base64.b64encode(saveas_bucket.encode('utf-8')).decode('ascii')
+            query["x-tos-save-bucket"] = _b64_param(saveas_bucket)
+        if saveas_object:
+            query["x-tos-save-object"] = _b64_param(saveas_object)
+            # 转存时只返回很小的 json 结果，使用更小的大小上限并一次性读取
+            return await self._fetch_body(bucket_name, key, query, b64=False, action="get video snapshot",
+                                          max_size=min(self.max_object_size, _SAVEAS_MAX_SIZE), buffered=True)
 
-        chunk_size = 69 * 1024  # Using same chunk size as example for proven performance
+        return await self._fetch_body(bucket_name, key, query, b64=True, action="get video snapshot")
+
+    async def _fetch_body(self, bucket_name: str, key: str, params: Optional[dict] = None, *,
+                          b64: bool, action: str, max_size: Optional[int] = None, buffered: bool = False) -> str:
+        """
+        发起 GET 请求并读取响应体，统一处理状态码、大小限制校验及连接释放
+        Args:
+            bucket_name: 存储桶名称
+            key: 对象名称
+            params: 请求参数
+            b64: 为 True 时返回 base64 编码结果，否则按 utf-8 解码为文本
+            action: 操作名称，用于构造错误信息
+            max_size: 响应体大小上限，默认为 max_object_size
+            buffered: 响应体为较小的 json 时设为 True，一次性读取后解码，省去逐块读取的开销
+        """
+        if max_size is None:
+            max_size = self.max_object_size
 
         response = None
         try:
-            response = await self.get(bucket=bucket_name, key=key, params=query)
+            # 流式请求，先校验响应头中的大小，超限时不再下载响应体
+            response = await self.get(bucket=bucket_name, key=key, params=params, stream=True)
             if response.status_code == 200 or response.status_code == 206:
-                if int(response.headers.get('content-length', "0")) > self.max_object_size:
-                    raise Exception(
-                        f"Bucket: {bucket_name} object: {key} is too large, more than {self.max_object_size} bytes")
-
-                content = bytearray()
-                async for chunk in response.aiter_bytes(chunk_size):
-                    content.extend(chunk)
+                length_header = response.headers.get('content-length')
+                content_len = int(length_header) if length_header else 0
+                if content_len > max_size:
+                    raise Exception(_OBJECT_TOO_LARGE_MSG % (bucket_name, key, max_size))
 
-                if saveas_object:
-                    return content.decode('utf-8')
+                if b64:
+                    return await _encode_body(response, bucket_name, key, self.download_chunk_size, max_size)
+                # 有 content-encoding 时 content-length 是压缩后的大小，与解码后的内容长度不一致，按长度未知处理
+                body_len = content_len if _is_identity_encoding(response) else 0
+                if buffered and body_len:
+                    # 未压缩且长度已知、已校验时一次性读取，其余情况仍按块读取以便限制解码后的大小
+                    content = await response.aread()
                 else:
-                    return base64.b64encode(content).decode()
+                    content = await _read_body(response, bucket_name, key, max_size, body_len)
+                return str(content, 'utf-8')
             else:
-                raise Exception(f"get video snapshot failed, tos server return: {response.json()}")
+                raise Exception(f"{action} failed, tos server return: {await read_error_body(response)}")
         finally:
             if response is not None:
                 await response.aclose()
 
 
+class Base64StreamEncoder:
+    """
+        增量 base64 编码器，按块输入原始数据，结果与一次性编码整个数据相同
+    """
+
+    def __init__(self):
+        self._parts = []
+        self._tail = b''
+
+    def update(self, chunk) -> None:
+        """
+        编码一块数据。base64 以 3 字节为一组编码，只编码按 3 字节对齐的部分，不足一组的尾部留到下一块
+        Args:
+            chunk: bytes、bytearray 等支持 buffer 协议的对象
+        """
+        view = memoryview(chunk)
+        start = 0
+        if self._tail:
+            start = 3 - len(self._tail)
+            if len(view) < start:
+                self._tail += bytes(view)
+                return
+            self._parts.append(_b64encode(self._tail + view[:start]))
+        end = len(view) - (len(view) - start) % 3
+        self._parts.append(_b64encode(view[start:end]))
+        self._tail = bytes(view[end:])
+
+    def finish(self) -> str:
+        """编码剩余的尾部 (补齐 padding) 并返回完整的 base64 字符串"""
+        if self._tail:
+            self._parts.append(_b64encode(self._tail))
+            self._tail = b''
+        encoded = b''.join(self._parts)
+        # 先释放各分段再解码为 str，峰值内存为两份编码结果而不是三份
+        self._parts = []
+        return encoded.decode('ascii')
+
+
+def _is_identity_encoding(response) -> bool:
+    """响应体未经压缩编码时返回 True，此时 content-length 即为对象内容的长度"""
+    return response.headers.get('content-encoding', 'identity') == 'identity'
+
+
+async def _encode_body(response, bucket_name: str, key: str, chunk_size: int, max_size: int) -> str:
+    """
+    按块读取响应体并增量进行 base64 编码，避免缓存整个原始对象
+    Args:
+        response: 状态码已校验的响应
+        bucket_name: 存储桶名称，用于构造错误信息
+        key: 对象名称，用于构造错误信息
+        chunk_size: 每次读取的字节数
+        max_size: 响应体大小上限，content-length 缺失或不准确时也按块校验，超出后立即中止读取
+    """
+    encoder = Base64StreamEncoder()
+    loop = asyncio.get_running_loop()
+    pending = None
+    total = 0
+    # 未声明 content-encoding 时原始字节即为对象内容，直接读取原始流，跳过 httpx 的解码器
+    if _is_identity_encoding(response):
+        chunks = response.aiter_raw(chunk_size)
+    else:
+        chunks = response.aiter_bytes(chunk_size)
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > max_size:
+            raise Exception(_OBJECT_TOO_LARGE_MSG % (bucket_name, key, max_size))
+        # 编码器需按顺序处理各块，开始下一块前先等待上一块编码完成
+        if pending is not None:
+            await pending
+            pending = None
+        if len(chunk) >= _OFFLOAD_THRESHOLD:
+            # pybase64 编码时会释放 GIL，大块放到线程中编码，与下一块的网络读取重叠进行，同时不阻塞事件循环
+            pending = loop.run_in_executor(None, encoder.update, chunk)
+        else:
+            encoder.update(chunk)
+    if pending is not None:
+        await pending
+    return encoder.finish()
+
+
+async def _read_body(response, bucket_name: str, key: str, max_size: int, expected_len: int = 0):
+    """
+    读取完整的原始响应体。数据会被拷贝到自有缓冲区，因此直接使用 httpx 收到的原始块，
+    不指定 chunk_size，省去 httpx 按固定大小重新切分时的额外拷贝
+    Args:
+        response: 状态码已校验的响应
+        bucket_name: 存储桶名称，用于构造错误信息
+        key: 对象名称，用于构造错误信息
+        max_size: 响应体大小上限
+        expected_len: 未压缩响应的 content-length (调用方已校验不超过 max_size)，为 0 表示未知
+    Returns:
+        memoryview 或 bytes，可直接用 str(content, 'utf-8') 解码
+    """
+    if expected_len:
+        # 长度已知时一次分配到位，通过 memoryview 按偏移写入，避免扩容拷贝
+        content = bytearray(expected_len)
+        view = memoryview(content)
+        offset = 0
+        async for chunk in response.aiter_bytes():
+            size = len(chunk)
+            if offset + size > expected_len:
+                raise Exception(_BODY_LENGTH_MISMATCH_MSG % expected_len)
+            view[offset:offset + size] = chunk
+            offset += size
+        # 返回已写入部分的视图，调用方直接从缓冲区解码，无需再截断或拷贝
+        return view[:offset]
+
+    # 长度未知或响应体经过压缩时收集解码后的块，按累计大小限制，最后由 b''.join 一次分配并拷贝
+    chunks = []
+    total = 0
+    async for chunk in response.aiter_bytes():
+        total += len(chunk)
+        if total > max_size:
+            raise Exception(_OBJECT_TOO_LARGE_MSG % (bucket_name, key, max_size))
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+
+@functools.lru_cache(maxsize=512)
+def _snapshot_process(t: Optional[int], w: Optional[int], h: Optional[int], m: Optional[str],
+                      f: Optional[str], ar: Optional[str]) -> str:
+    """构造 video/snapshot 的 x-tos-process 参数值，相同截图参数的重复请求直接命中缓存"""
+    parts = [prefix + str(v) for prefix, v in zip(_SNAPSHOT_PARAM_PREFIXES, (t, w, h, m, f, ar)) if v is not None]
+    return "video/snapshot" + "".join(parts)
+
+
+def _b64_param(value: str) -> str:
+    """对请求参数值做 utf-8 + 标准 base64 编码，用于 x-tos-save-* 等参数"""
+    return _b64encode(value.encode('utf-8')).decode('ascii')
+
+
 def is_text_file(key: str) -> bool:
     """Determine if a file is text-based by its extension"""
-    text_extensions = {
-        '.txt', '.log', '.json', '.xml', '.yml', '.yaml', '.md',
-        '.csv', '.ini', '.conf', '.py', '.js', '.html', '.css',
-        '.sh', '.bash', '.cfg', '.properties'
-    }
-    return any(key.lower().endswith(ext) for ext in text_extensions)
+    # 只需对可能匹配扩展名的末尾部分做 lower()
+    return key[-_MAX_TEXT_EXTENSION_LEN:].lower().endswith(_TEXT_EXTENSIONS)
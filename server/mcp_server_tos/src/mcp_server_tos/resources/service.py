@@ -11,6 +11,11 @@ from requests.structures import CaseInsensitiveDict
 from tos import TosClientV2, exceptions, HttpMethodType
 from tos.http import Request
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 UNSIGNED_PAYLOAD = 'UNSIGNED-PAYLOAD'
 TOS_USER_AGENT = 've-tos-python-sdk/v2.8.1 (linux/amd64;python3.12.0) -- TOS/MCP Server/v0.1.0'
 
@@ -26,6 +31,18 @@ _global_client = httpx.AsyncClient(
 )
 
 
+def response_json(response: httpx.Response):
+    """解析响应体 json，优先使用 orjson，直接解析 bytes 省去解码为 str 的拷贝"""
+    return _json_loads(response.content)
+
+
+async def read_error_body(response: httpx.Response, limit: int = 1024) -> str:
+    """读取错误响应体的前 limit 个字节用于构造错误信息，不完整读取或解析可能很大的响应体"""
+    async for chunk in response.aiter_bytes(limit):
+        return chunk.decode('utf-8', errors='replace')
+    return ''
+
+
 class TosResource:
     client: TosClientV2 = None
 
@@ -48,7 +65,11 @@ class TosResource:
         return []
 
     async def get(self, bucket: str, key: str = None, headers: Dict[str, str] = None,
-                  params: Dict[str, str] = None):
+                  params: Dict[str, str] = None, stream: bool = False):
+        """
+        发起预签名 GET 请求，5xx 与 429 时重试
+        stream 为 True 时只读取响应头即返回，响应体由调用方按需读取，调用方需负责 aclose
+        """
         if key is not None:
             _is_valid_object_name(key)
 
@@ -65,9 +86,9 @@ class TosResource:
         attempt = 0
         while attempt < 3:
             try:
-                response = await _global_client.get(sign_out.signed_url, follow_redirects=False,
-                                                    headers=headers, params=params,
-                                                    timeout=httpx.Timeout(connect=10, read=30, write=10, pool=10))
+                request = _global_client.build_request("GET", sign_out.signed_url, headers=headers, params=params,
+                                                       timeout=httpx.Timeout(connect=10, read=30, write=10, pool=10))
+                response = await _global_client.send(request, follow_redirects=False, stream=stream)
                 if response.status_code >= 500 or response.status_code == 429:
                     await response.aclose()
                     attempt += 1
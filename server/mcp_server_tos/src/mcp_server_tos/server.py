@@ -1,22 +1,28 @@
-import base64
-import json
+import functools
 import logging
 import os
-from typing import Optional
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from mcp.server.session import ServerSession
 from mcp.server.fastmcp import Context, FastMCP
 from starlette.requests import Request
 
 from mcp_server_tos.config import load_config, TosConfig, TOS_CONFIG, LOCAL_DEPLOY_MODE
-from mcp_server_tos.credential import Credential
+from mcp_server_tos.credential import Credential, parse_auth
 from mcp_server_tos.resources.bucket import BucketResource
 from mcp_server_tos.resources.object import ObjectResource
 
 logger = logging.getLogger(__name__)
 
+_HOST = os.getenv("MCP_SERVER_HOST", "127.0.0.1")
+_PORT = int(os.getenv("PORT", "8000"))
+
 # Initialize FastMCP server
-mcp = FastMCP("TOS MCP Server", host=os.getenv("MCP_SERVER_HOST", "127.0.0.1"), port=int(os.getenv("PORT", "8000")))
+mcp = FastMCP("TOS MCP Server", host=_HOST, port=_PORT)
+
+# stdio 模式下认证信息来自环境变量，进程生命周期内不变，启动时读取一次
+_STDIO_AUTH = os.getenv("authorization", None)
 
 
 def get_credential_from_request():
@@ -28,51 +34,72 @@ def get_credential_from_request():
         # 从 header 的 authorization 字段读取 base64 编码后的 sts json
         auth = raw_request.headers.get("authorization", None)
     if auth is None:
-        # 如果 header 中没有认证信息，可能是 stdio 模式，尝试从环境变量获取
-        auth = os.getenv("authorization", None)
+        # 如果 header 中没有认证信息，可能是 stdio 模式，使用启动时从环境变量读取的值
+        auth = _STDIO_AUTH
     if auth is None:
         # 获取认证信息失败
         raise ValueError("Missing authorization info.")
 
-    if ' ' in auth:
-        _, base64_data = auth.split(' ', 1)
-    else:
-        base64_data = auth
-
     try:
-        # 解码 Base64
-        decoded_str = base64.b64decode(base64_data).decode('utf-8')
-        data = json.loads(decoded_str)
-        # 获取字段
-        current_time = data.get('CurrentTime')
-        expired_time = data.get('ExpiredTime')
-        ak = data.get('AccessKeyId')
-        sk = data.get('SecretAccessKey')
-        session_token = data.get('SessionToken')
-        if not ak or not sk or not session_token:
-            raise ValueError("Invalid credentials ak, sk, session_token is null")
-
-        return Credential(ak, sk, session_token, expired_time)
+        return _decode_auth(auth)
     except Exception as e:
-        logger.error(f"Error get credentials: {str(e)}")
+        logger.error("Error get credentials: %s", e)
         raise
 
 
-def get_tos_config() -> TosConfig:
-    if TOS_CONFIG.deploy_mode == LOCAL_DEPLOY_MODE:
-        return TOS_CONFIG
+# 同一会话内客户端会反复携带相同的 authorization，按原始字符串缓存解码结果，避免每次调用重复 base64 + json 解析
+_decode_auth = functools.lru_cache(maxsize=512)(parse_auth)
+
+
+def _build_sts_tos_config(credential: Credential) -> TosConfig:
+    return TosConfig(
+        access_key=credential.access_key,
+        secret_key=credential.secret_key,
+        security_token=credential.security_token,
+        region=TOS_CONFIG.region,
+        endpoint=TOS_CONFIG.endpoint,
+        deploy_mode=TOS_CONFIG.deploy_mode,
+        max_object_size=TOS_CONFIG.max_object_size,
+        download_chunk_size=TOS_CONFIG.download_chunk_size,
+        buckets=[]
+    )
+
+
+@functools.cache
+def _get_local_resources() -> Tuple[BucketResource, ObjectResource]:
+    return BucketResource(TOS_CONFIG), ObjectResource(TOS_CONFIG)
+
+
+# 按凭证缓存 Bucket/Object 资源对象，同一凭证的调用复用其中的 TosClientV2，超出容量时淘汰最久未使用的凭证
+_RESOURCE_CACHE_SIZE = 128
+_resource_cache: "OrderedDict[Credential, Tuple[BucketResource, ObjectResource]]" = OrderedDict()
+
+
+def _get_sts_resources() -> Tuple[BucketResource, ObjectResource]:
+    credential = get_credential_from_request()
+    resources = _resource_cache.get(credential)
+    if resources is None:
+        # 仅在缓存未命中时构建配置
+        config = _build_sts_tos_config(credential)
+        resources = (BucketResource(config), ObjectResource(config))
+        _resource_cache[credential] = resources
+        if len(_resource_cache) > _RESOURCE_CACHE_SIZE:
+            _resource_cache.popitem(last=False)
     else:
-        credential = get_credential_from_request()
-        return TosConfig(
-            access_key=credential.access_key,
-            secret_key=credential.secret_key,
-            security_token=credential.security_token,
-            region=TOS_CONFIG.region,
-            endpoint=TOS_CONFIG.endpoint,
-            deploy_mode=TOS_CONFIG.deploy_mode,
-            max_object_size=TOS_CONFIG.max_object_size,
-            buckets=[]
-        )
+        _resource_cache.move_to_end(credential)
+    return resources
+
+
+# 部署模式在进程启动时即已确定，导入时选定实现，避免每次调用都判断一次
+get_resources = _get_local_resources if TOS_CONFIG.deploy_mode == LOCAL_DEPLOY_MODE else _get_sts_resources
+
+
+def get_bucket_resource() -> BucketResource:
+    return get_resources()[0]
+
+
+def get_object_resource() -> ObjectResource:
+    return get_resources()[1]
 
 
 @mcp.tool()
@@ -82,13 +109,7 @@ async def list_buckets():
     Returns:
         A list of buckets.
     """
-    try:
-        config = get_tos_config()
-        tos_resource = BucketResource(config)
-        buckets = await tos_resource.list_buckets()
-        return buckets
-    except Exception:
-        raise
+    return await get_bucket_resource().list_buckets()
 
 
 @mcp.tool()
@@ -104,13 +125,7 @@ async def list_objects(bucket: str, prefix: Optional[str] = None, start_after: O
     Returns:
         A list of objects.
     """
-    try:
-        config = get_tos_config()
-        tos_resource = BucketResource(config)
-        objects = await tos_resource.list_objects(bucket, prefix, start_after, continuation_token)
-        return objects
-    except Exception:
-        raise
+    return await get_bucket_resource().list_objects(bucket, prefix, start_after, continuation_token)
 
 
 @mcp.tool()
@@ -124,13 +139,7 @@ async def get_object(bucket: str, key: str):
         If the object content is text format, return the content as string.
         If the object content is binary format, return the content as base64 encoded string.
     """
-    try:
-        config = get_tos_config()
-        tos_resource = ObjectResource(config)
-        content = await tos_resource.get_object(bucket, key)
-        return content
-    except Exception:
-        raise
+    return await get_object_resource().get_object(bucket, key)
 
 @mcp.tool()
 async def video_info(bucket_name: str, key: str):
@@ -143,13 +152,7 @@ async def video_info(bucket_name: str, key: str):
     Returns:
         return the video file information in json format as string.
     """
-    try:
-        config = get_tos_config()
-        tos_resource = ObjectResource(config)
-        content = await tos_resource.video_info(bucket_name, key)
-        return content
-    except Exception:
-        raise
+    return await get_object_resource().video_info(bucket_name, key)
 
 @mcp.tool()
 async def video_snapshot(bucket_name: str, key: str, time: Optional[int] = None,
@@ -179,11 +182,6 @@ async def video_snapshot(bucket_name: str, key: str, time: Optional[int] = None,
     Returns:
         If saveas is specified, return the saveas object information in json format; otherwise, return the snapshot image (JPG or PNG) as a base64-encoded string.
     """
-    try:
-        config = get_tos_config()
-        tos_resource = ObjectResource(config)
-        content = await tos_resource.video_snapshot(bucket_name, key, time, width, height, mode, output_format,
-                                                    auto_rotate, saveas_object, saveas_bucket)
-        return content
-    except Exception:
-        raise
\ No newline at end of file
+    return await get_object_resource().video_snapshot(bucket_name, key, time, width, height, mode,
+                                                      output_format, auto_rotate, saveas_object,
+                                                      saveas_bucket)
@@ -0,0 +1,8 @@
+import os
+
+# mcp_server_tos.config 在导入时即校验环境变量，测试使用本地模式的占位配置，请求均由 MockTransport 处理
+os.environ.setdefault("DEPLOY_MODE", "local")
+os.environ.setdefault("VOLCENGINE_ACCESS_KEY", "test-ak")
+os.environ.setdefault("VOLCENGINE_SECRET_KEY", "test-sk")
+os.environ.setdefault("VOLCENGINE_REGION", "cn-beijing")
+os.environ.setdefault("TOS_ENDPOINT", "tos-cn-beijing.volces.com")
@@ -0,0 +1,129 @@
+import asyncio
+import base64
+import gzip
+import os
+import random
+
+import httpx
+import pytest
+
+from mcp_server_tos.config import TOS_CONFIG
+from mcp_server_tos.resources import service
+from mcp_server_tos.resources.object import Base64StreamEncoder, ObjectResource
+
+BUCKET = "test-bucket"
+BINARY = os.urandom(3000)
+TEXT = "line of text 中文\n".encode("utf-8") * 600
+
+
+def stream(data: bytes, chunk_size: int = 1000):
+    async def gen():
+        for i in range(0, len(data), chunk_size):
+            yield data[i:i + chunk_size]
+
+    return gen()
+
+
+def body_response(data: bytes, gzipped: bool = False, with_length: bool = True) -> httpx.Response:
+    headers = {}
+    if gzipped:
+        data = gzip.compress(data)
+        headers["content-encoding"] = "gzip"
+    if with_length:
+        headers["content-length"] = str(len(data))
+    return httpx.Response(200, content=stream(data), headers=headers)
+
+
+@pytest.fixture
+def objects(monkeypatch):
+    """返回 (ObjectResource, routes)，routes 为 key -> 响应构造函数，未配置的 key 返回 404"""
+    routes = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        build = routes.get(request.url.path.lstrip("/"))
+        if build is None:
+            return httpx.Response(404, content=stream(b'{"Code":"NoSuchKey"}'))
+        return build()
+
+    monkeypatch.setattr(service, "_global_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    resource = ObjectResource(TOS_CONFIG)
+    resource.max_object_size = 100000
+    return resource, routes
+
+
+def test_base64_stream_encoder_random_splits():
+    rng = random.Random(20240601)
+    for size in list(range(0, 12)) + [rng.randrange(12, 5000) for _ in range(50)]:
+        data = rng.randbytes(size)
+        encoder = Base64StreamEncoder()
+        offset = 0
+        while offset < size:
+            step = rng.randrange(0, 9) if rng.random() < 0.5 else rng.randrange(0, 700)
+            encoder.update(data[offset:offset + step])
+            offset += step
+        assert encoder.finish() == base64.b64encode(data).decode("ascii")
+
+
+@pytest.mark.parametrize("gzipped", [False, True])
+@pytest.mark.parametrize("with_length", [False, True])
+def test_get_object_text(objects, gzipped, with_length):
+    resource, routes = objects
+    routes["a.txt"] = lambda: body_response(TEXT, gzipped, with_length)
+    assert asyncio.run(resource.get_object(BUCKET, "a.txt")) == TEXT.decode("utf-8")
+
+
+@pytest.mark.parametrize("gzipped", [False, True])
+@pytest.mark.parametrize("with_length", [False, True])
+def test_get_object_binary(objects, gzipped, with_length):
+    resource, routes = objects
+    routes["a.bin"] = lambda: body_response(BINARY, gzipped, with_length)
+    assert asyncio.run(resource.get_object(BUCKET, "a.bin")) == base64.b64encode(BINARY).decode("ascii")
+
+
+def test_content_length_over_max_size(objects):
+    resource, routes = objects
+    resource.max_object_size = 100
+    routes["a.bin"] = lambda: body_response(BINARY)
+    with pytest.raises(Exception, match=f"Bucket: {BUCKET} object: a.bin is too large, more than 100 bytes"):
+        asyncio.run(resource.get_object(BUCKET, "a.bin"))
+
+
+@pytest.mark.parametrize("key", ["a.txt", "a.bin"])
+def test_missing_content_length_over_max_size(objects, key):
+    resource, routes = objects
+    resource.max_object_size = 2000
+    routes[key] = lambda: body_response(TEXT, with_length=False)
+    with pytest.raises(Exception, match=f"Bucket: {BUCKET} object: {key} is too large, more than 2000 bytes"):
+        asyncio.run(resource.get_object(BUCKET, key))
+
+
+@pytest.mark.parametrize("key", ["a.txt", "a.bin"])
+def test_gzip_decoded_size_over_max_size(objects, key):
+    # content-length 为压缩后的大小，可以通过校验，解码后的内容仍需受 max_size 限制
+    resource, routes = objects
+    resource.max_object_size = 2000
+    routes[key] = lambda: body_response(TEXT, gzipped=True)
+    with pytest.raises(Exception, match=f"Bucket: {BUCKET} object: {key} is too large, more than 2000 bytes"):
+        asyncio.run(resource.get_object(BUCKET, key))
+
+
+def test_video_info_gzip_over_max_size(objects):
+    resource, routes = objects
+    resource.max_object_size = 2000
+    routes["v.mp4"] = lambda: body_response(b'{"format": "' + b"x" * 20000 + b'"}', gzipped=True)
+    with pytest.raises(Exception, match="is too large"):
+        asyncio.run(resource.video_info(BUCKET, "v.mp4"))
+
+
+def test_error_body(objects):
+    resource, _ = objects
+    with pytest.raises(Exception, match='get object failed, tos server return: {"Code":"NoSuchKey"}'):
+        asyncio.run(resource.get_object(BUCKET, "missing.txt"))
+
+
+def test_error_body_truncated(objects):
+    resource, routes = objects
+    routes["a.txt"] = lambda: httpx.Response(403, content=stream(b"e" * 5000))
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(resource.get_object(BUCKET, "a.txt"))
+    assert str(exc_info.value) == "get object failed, tos server return: " + "e" * 1024
@@ -0,0 +1,69 @@
+import base64
+import json
+
+import pytest
+
+from mcp_server_tos.credential import Credential, parse_auth
+
+STS = {
+    "AccessKeyId": "AKLT-test",
+    "SecretAccessKey": "secret>>>???",
+    "SessionToken": "token~~~>>>???",
+    "ExpiredTime": "2024-06-01T12:00:00+08:00",
+}
+EXPECTED = Credential("AKLT-test", "secret>>>???", "token~~~>>>???", "2024-06-01T12:00:00+08:00")
+
+
+def encode(data) -> str:
+    return base64.b64encode(json.dumps(data).encode("utf-8")).decode("ascii")
+
+
+def test_parse_auth_bare():
+    assert parse_auth(encode(STS)) == EXPECTED
+
+
+def test_parse_auth_bearer():
+    assert parse_auth("Bearer " + encode(STS)) == EXPECTED
+
+
+def test_parse_auth_double_space_after_scheme():
+    assert parse_auth("Bearer  " + encode(STS)) == EXPECTED
+
+
+def test_parse_auth_line_wrapped():
+    # base64 命令行工具按 76 列折行输出，stdio 模式下可能原样写入环境变量
+    wrapped = base64.encodebytes(json.dumps(STS).encode("utf-8")).decode("ascii")
+    assert "\n" in wrapped
+    assert parse_auth(wrapped) == EXPECTED
+    assert parse_auth("Bearer " + wrapped) == EXPECTED
+
+
+def test_parse_auth_missing_expired_time():
+    data = {k: v for k, v in STS.items() if k != "ExpiredTime"}
+    assert parse_auth(encode(data)).expired_time is None
+
+
+@pytest.mark.parametrize("auth", [
+    "abc",
+    "ab!d",
+    "Bearer a===",
+    base64.urlsafe_b64encode(json.dumps(STS).encode("utf-8")).decode("ascii"),
+])
+def test_parse_auth_rejects_invalid_base64(auth):
+    with pytest.raises(ValueError, match="not valid base64"):
+        parse_auth(auth)
+
+
+@pytest.mark.parametrize("field", ["AccessKeyId", "SecretAccessKey", "SessionToken"])
+def test_parse_auth_missing_field(field):
+    data = {k: v for k, v in STS.items() if k != field}
+    with pytest.raises(ValueError, match="ak, sk, session_token is null"):
+        parse_auth(encode(data))
+    with pytest.raises(ValueError, match="ak, sk, session_token is null"):
+        parse_auth(encode({**STS, field: ""}))
+
+
+@pytest.mark.parametrize("data", [[1], "text", 1, None])
+def test_parse_auth_non_object_json(data):
+    with pytest.raises(ValueError, match="ak, sk, session_token is null"):
+        parse_auth(encode(data))